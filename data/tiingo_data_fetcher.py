@@ -1,20 +1,55 @@
+import functools
+import json
 import os
+import re
+import uuid
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 import requests
 from dotenv import load_dotenv
+from pyarrow import fs
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-# Load the .env.local file if it exists, otherwise load .env
-if os.path.exists(".env.local"):
-    print("Loading .env.local file...")
-    load_dotenv(dotenv_path=".env.local", override=True)
-else:
-    print("Loading .env file...")
-    load_dotenv(dotenv_path=".env")  # Defaults to loading .env
-
-# Retrieve the API keys from environment variables
-TIINGO_API_KEY = os.getenv("TIINGO_API_KEY")
 BASE_APIURL = "https://api.tiingo.com"
+TIINGO_COLUMNS = ["date", "open", "high", "low", "close", "volume"]
+
+# Fixed cache schema, so appends with differently inferred dtypes stay readable together
+CACHE_SCHEMA = pa.schema(
+    [
+        ("date", pa.timestamp("ns", tz="UTC")),
+        ("open", pa.float64()),
+        ("high", pa.float64()),
+        ("low", pa.float64()),
+        ("close", pa.float64()),
+        ("volume", pa.float64()),
+    ]
+)
+# Index of downloaded day ranges; the leading underscore keeps it out of dataset discovery
+RANGES_FILE = "_ranges.json"
+# Stock frequencies whose bars aggregate over the request window. A sub-range request
+# returns partial bars labelled with its last date, so these can't be merged by range
+RESAMPLED_FREQUENCIES = {"weekly", "monthly", "annually"}
+PARTITION_SCHEMA = pa.schema([("year", pa.int32()), ("month", pa.int32())])
+DATASET_SCHEMA = pa.schema(list(CACHE_SCHEMA) + list(PARTITION_SCHEMA))
+
+
+@functools.cache
+def _load_env():
+    """Load the .env.local file if it exists, otherwise load .env (at most once per process)."""
+    # Nothing to load when the API key is already provided by the environment
+    if os.getenv("TIINGO_API_KEY"):
+        return
+
+    if os.path.exists(".env.local"):
+        print("Loading .env.local file...")
+        load_dotenv(dotenv_path=".env.local", override=True)
+    else:
+        print("Loading .env file...")
+        load_dotenv(dotenv_path=".env")  # Defaults to loading .env
 
 
 class DataFetcher:
@@ -23,32 +58,339 @@ class DataFetcher:
     """
 
     def __init__(self, cache_folder="data/sets"):
+        _load_env()
+
         self.cache_folder = cache_folder
         if not os.path.exists(self.cache_folder):
             os.makedirs(self.cache_folder)  # Ensure the 'sets' folder exists
 
-    def _generate_filename(self, symbol, start_date, end_date, frequency):
-        """Generate a unique filename for the CSV based on the symbol and parameters."""
-        return os.path.join(
-            self.cache_folder, f"{symbol}_{start_date}_to_{end_date}_{frequency}.csv"
+        # Reuse one pooled keep-alive session for every Tiingo request
+        self._session = requests.Session()
+        self._session.headers.update(
+            {
+                "Content-Type": "application/json",
+                "Authorization": f"Token {os.getenv('TIINGO_API_KEY')}",
+            }
+        )
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False,  # Return the final response so callers check its status
+        )
+        self._session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=1, pool_maxsize=16, max_retries=retry),
+        )
+
+    def _dataset_path(self, symbol, frequency):
+        """Return the cache directory holding every downloaded range for the symbol and frequency."""
+        return os.path.join(self.cache_folder, f"{symbol}_{frequency}")
+
+    @staticmethod
+    def _open_dataset(path):
+        """Open the cache directory as a memory-mapped, hive-partitioned Parquet dataset."""
+        return ds.dataset(
+            path,
+            schema=DATASET_SCHEMA,
+            format="parquet",
+            partitioning=ds.partitioning(PARTITION_SCHEMA, flavor="hive"),
+            filesystem=fs.LocalFileSystem(use_mmap=True),
+        )
+
+    @staticmethod
+    def _date_filter(start_date, end_date):
+        """Build a dataset filter selecting rows between two dates (inclusive)."""
+        start = pd.Timestamp(start_date, tz="UTC")
+        end = pd.Timestamp(end_date, tz="UTC") + pd.Timedelta(days=1)
+        return (
+            (ds.field("year") >= start.year)
+            & (ds.field("year") <= end.year)
+            & (ds.field("date") >= pa.scalar(start))
+            & (ds.field("date") < pa.scalar(end))
+        )
+
+    @staticmethod
+    def _read_ranges(path):
+        """Return the inclusive day ranges already downloaded into the cache, sorted."""
+        ranges_file = os.path.join(path, RANGES_FILE)
+        if not os.path.exists(ranges_file):
+            return []
+
+        with open(ranges_file, encoding="utf-8") as f:
+            return [
+                (pd.Timestamp(start), pd.Timestamp(end)) for start, end in json.load(f)
+            ]
+
+    def _record_range(self, path, start, end):
+        """Add a downloaded day range to the cache index, merging touching ranges."""
+        ranges = sorted(self._read_ranges(path) + [(start, end)])
+        merged = [ranges[0]]
+        for range_start, range_end in ranges[1:]:
+            if range_start <= merged[-1][1] + pd.Timedelta(days=1):
+                merged[-1] = (merged[-1][0], max(merged[-1][1], range_end))
+            else:
+                merged.append((range_start, range_end))
+
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, RANGES_FILE), "w", encoding="utf-8") as f:
+            json.dump(
+                [[s.strftime("%Y-%m-%d"), e.strftime("%Y-%m-%d")] for s, e in merged], f
+            )
+
+    @staticmethod
+    def _missing_ranges(covered, start, end):
+        """List the day ranges between start and end (inclusive) not yet downloaded."""
+        missing = []
+        cursor = start
+        for range_start, range_end in covered:
+            if range_end < cursor:
+                continue
+            if range_start > end:
+                break
+            if range_start > cursor:
+                missing.append((cursor, range_start - pd.Timedelta(days=1)))
+            cursor = max(cursor, range_end + pd.Timedelta(days=1))
+        if cursor <= end:
+            missing.append((cursor, end))
+        return missing
+
+    @staticmethod
+    def _last_complete_day():
+        """Return yesterday (UTC), the last day whose data can no longer change."""
+        today = pd.Timestamp.now(tz="UTC").tz_localize(None).normalize()
+        return today - pd.Timedelta(days=1)
+
+    def _drop_cached_rows(self, df, path):
+        """Drop fetched rows whose timestamps are already in the cache."""
+        if not os.path.isdir(path):
+            return df
+
+        cached = self._open_dataset(path).to_table(
+            columns=["date"],
+            filter=(ds.field("date") >= pa.scalar(df["date"].min()))
+            & (ds.field("date") <= pa.scalar(df["date"].max())),
+        )
+        cached_dates = pd.DatetimeIndex(cached["date"].to_pandas())
+        return df[~df["date"].isin(cached_dates)]
+
+    def _load_cache(self, path, start_date, end_date):
+        """Load the cached rows within the requested range."""
+        table = self._open_dataset(path).to_table(
+            columns=TIINGO_COLUMNS, filter=self._date_filter(start_date, end_date)
+        )
+        df = table.to_pandas(split_blocks=True, self_destruct=True)
+        return df.sort_values("date", ignore_index=True)
+
+    def _append_cache(self, df, path):
+        """Append newly fetched rows to the cache, partitioned by year and month."""
+        table = pa.Table.from_pandas(
+            df.assign(year=df["date"].dt.year, month=df["date"].dt.month),
+            schema=DATASET_SCHEMA,
+            preserve_index=False,
+        )
+        ds.write_dataset(
+            table,
+            path,
+            format="parquet",
+            partitioning=ds.partitioning(PARTITION_SCHEMA, flavor="hive"),
+            # Unique file names so new chunks never replace previously cached ones
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+        )
+
+    def _store_range(self, df, path, start, end):
+        """
+        Append the new rows fetched for a day range and record the days it covers.
+
+        :return: The last day present in the data and whether any new rows were added.
+        """
+        df = df.assign(
+            date=pd.to_datetime(df["date"], utc=True).astype("datetime64[ns, UTC]")
+        )
+        last_day = df["date"].max().tz_convert(None).normalize()
+
+        new_rows = self._drop_cached_rows(df, path)
+        if not new_rows.empty:
+            print(f"Saving data for {start.date()} to {end.date()} in {path}...")
+            self._append_cache(new_rows, path)
+
+        # Data that added rows may be truncated mid-day, so its last day stays uncovered
+        # until a follow-up request returns nothing new. Only whole past days are covered,
+        # so today's partial data is always fetched again
+        covered_end = min(
+            last_day - pd.Timedelta(days=1) if not new_rows.empty else end,
+            end,
+            self._last_complete_day(),
+        )
+        if covered_end >= start:
+            self._record_range(path, start, covered_end)
+
+        return last_day, not new_rows.empty
+
+    # pylint: disable=too-many-arguments
+    def _fetch_range(self, symbol, start, end, frequency, request, path):
+        """Download one missing day range into the cache, continuing truncated responses."""
+        cursor = start
+        while True:
+            df = request(
+                symbol, cursor.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"), frequency
+            )
+            if df is None:
+                return  # Leave the range uncovered so a failed request is retried
+
+            if df.empty:
+                # Nothing trades in the range (weekend, holiday or before listing)
+                covered_end = min(end, self._last_complete_day())
+                if covered_end >= cursor:
+                    self._record_range(path, cursor, covered_end)
+                return
+
+            last_day, added = self._store_range(df, path, cursor, end)
+            if not added:
+                return
+            cursor = max(cursor, min(last_day, end))
+
+    def _import_legacy_cache(self, symbol, frequency, path):
+        """Import per-range cache files written before the dataset cache existed."""
+        pattern = re.compile(
+            rf"{re.escape(symbol)}_(.+)_to_(.+)_{re.escape(frequency)}\.(csv|parquet)"
+        )
+        for filename in sorted(os.listdir(self.cache_folder)):
+            match = pattern.fullmatch(filename)
+            if match is None:
+                continue
+
+            legacy_filename = os.path.join(self.cache_folder, filename)
+            try:
+                start = pd.Timestamp(match.group(1)).normalize()
+                end = pd.Timestamp(match.group(2)).normalize()
+                if match.group(3) == "csv":
+                    df = pd.read_csv(legacy_filename)
+                else:
+                    df = pd.read_parquet(legacy_filename)
+            except (ValueError, OSError, pd.errors.ParserError) as e:
+                print(f"Skipping legacy cache {legacy_filename}: {e}")
+                continue
+
+            if df.empty:
+                continue
+
+            print(f"Importing legacy cache {legacy_filename}...")
+            self._store_range(df[TIINGO_COLUMNS], path, start, end)
+
+    # pylint: disable=too-many-arguments
+    def _fetch_exact_range(self, symbol, start, end, frequency, request):
+        """Serve a resampled request from a cache file holding exactly the requested range."""
+        filename = os.path.join(
+            self.cache_folder,
+            f"{symbol}_{start.strftime('%Y-%m-%d')}_to_{end.strftime('%Y-%m-%d')}_{frequency}",
         )
+        if os.path.exists(f"{filename}.parquet"):
+            print(f"Loading data from {filename}.parquet...")
+            return pd.read_parquet(f"{filename}.parquet")
+        if os.path.exists(f"{filename}.csv"):
+            print(f"Loading data from {filename}.csv...")
+            return pd.read_csv(f"{filename}.csv", parse_dates=["date"])
+
+        df = request(
+            symbol, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"), frequency
+        )
+        if df is None:
+            return pd.DataFrame()
+        if df.empty:
+            return df
+
+        # A range reaching today ends in a still-open period, so it is not cached
+        today = pd.Timestamp.now(tz="UTC").tz_localize(None).normalize()
+        if end < today:
+            print(f"Saving data to {filename}.parquet...")
+            table = pa.Table.from_pandas(
+                df.assign(
+                    date=pd.to_datetime(df["date"], utc=True).astype(
+                        "datetime64[ns, UTC]"
+                    )
+                ),
+                schema=CACHE_SCHEMA,
+                preserve_index=False,
+            )
+            pq.write_table(table, f"{filename}.parquet", compression="zstd")
+        return df
+
+    # pylint: disable=too-many-arguments
+    def _fetch_with_cache(self, symbol, start_date, end_date, frequency, request):
+        """Serve a request from the cache, downloading only the ranges not yet cached."""
+        path = self._dataset_path(symbol, frequency)
+        start = pd.Timestamp(start_date).normalize()
+        end = pd.Timestamp(end_date).normalize()
+
+        if frequency in RESAMPLED_FREQUENCIES:
+            return self._fetch_exact_range(symbol, start, end, frequency, request)
+
+        # Fold in caches from the old one-file-per-request layout the first time
+        if not os.path.exists(os.path.join(path, RANGES_FILE)):
+            self._import_legacy_cache(symbol, frequency, path)
+
+        for range_start, range_end in self._missing_ranges(
+            self._read_ranges(path), start, end
+        ):
+            self._fetch_range(symbol, range_start, range_end, frequency, request, path)
+
+        if not os.path.isdir(path):
+            return pd.DataFrame()
+
+        print(f"Loading {symbol} data from {path}...")
+        return self._load_cache(path, start, end)
+
+    # pylint: disable=too-many-arguments
+    def iter_batches(self, symbol, start_date, end_date, frequency, batch_size=64_000):
+        """
+        Yield cached data in DataFrame chunks so large histories never sit fully in memory.
+        Batches come in ascending date order; at most one month of data is held at a time.
+        """
+        path = self._dataset_path(symbol, frequency)
+
+        if not os.path.isdir(path):
+            print(f"No cached data found at {path}")
+            return
+
+        dataset = self._open_dataset(path)
+        start = pd.Timestamp(start_date).normalize()
+        end = pd.Timestamp(end_date).normalize()
+
+        # Fragments are not stored in time order, so read month partitions in sequence
+        for month in pd.period_range(start, end, freq="M"):
+            table = dataset.to_table(
+                columns=TIINGO_COLUMNS,
+                filter=self._date_filter(start, end)
+                & (ds.field("year") == month.year)
+                & (ds.field("month") == month.month),
+            )
+            for batch in table.sort_by("date").to_batches(max_chunksize=batch_size):
+                yield batch.to_pandas()
 
     def fetch_tiingo_stock_data(self, symbol, start_date, end_date, frequency="daily"):
         """Fetch historical stock data from Tiingo."""
+        return self._fetch_with_cache(
+            symbol, start_date, end_date, frequency, self._request_tiingo_stock_data
+        )
 
-        filename = self._generate_filename(symbol, start_date, end_date, frequency)
+    def fetch_tiingo_crypto_data(self, symbol, start_date, end_date, frequency="5min"):
+        """Fetch historical cryptocurrency data from Tiingo."""
+        return self._fetch_with_cache(
+            symbol, start_date, end_date, frequency, self._request_tiingo_crypto_data
+        )
 
-        # Check if the CSV file already exists
-        if os.path.exists(filename):
-            print(f"Loading stock data from {filename}...")
-            return pd.read_csv(filename)
+    def _request_tiingo_stock_data(self, symbol, start_date, end_date, frequency):
+        """
+        Request historical stock data from the Tiingo API.
 
-        # Define the URL, headers, and parameters for the request
+        :return: The normalized data (empty when there is none), or None if the request failed.
+        """
+
+        # Define the URL and parameters for the request
         url = f"{BASE_APIURL}/tiingo/daily/{symbol}/prices"
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Token {TIINGO_API_KEY}",
-        }
         params = {
             "startDate": start_date,
             "endDate": end_date,
@@ -58,39 +400,31 @@ class DataFetcher:
             # annually: Values returned as annual data, with days ending on the last standard business day (Mon-Fri) of each year.
             "resampleFreq": frequency,
         }
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = self._session.get(url, params=params, timeout=10)
 
         if response.status_code != 200:
             print(
                 f"Error fetching stock data from Tiingo for {symbol}: {response.status_code}"
             )
-            return pd.DataFrame()  # Return an empty DataFrame if there’s an error
-
-        data = response.json()
-        df = self._normalize_tiingo_data(data, symbol)
+            return None
 
-        # Save the fetched data to CSV
-        print(f"Saving stock data to {filename}...")
-        df.to_csv(filename, index=False)
-
-        return df
+        try:
+            data = response.json()
+        except ValueError as e:
+            print(f"Error parsing response data: {e}")
+            return None
 
-    def fetch_tiingo_crypto_data(self, symbol, start_date, end_date, frequency="5min"):
-        """Fetch historical cryptocurrency data from Tiingo."""
+        return self._normalize_tiingo_data(data, symbol)
 
-        filename = self._generate_filename(symbol, start_date, end_date, frequency)
+    def _request_tiingo_crypto_data(self, symbol, start_date, end_date, frequency):
+        """
+        Request historical cryptocurrency data from the Tiingo API.
 
-        # Check if the CSV file already exists
-        if os.path.exists(filename):
-            print(f"Loading stock data from {filename}...")
-            return pd.read_csv(filename)
+        :return: The normalized data (empty when there is none), or None if the request failed.
+        """
 
-        # Define the URL, headers, and parameters for the request
+        # Define the URL and parameters for the request
         url = f"{BASE_APIURL}/tiingo/crypto/prices"
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Token {TIINGO_API_KEY}",
-        }
         params = {
             "tickers": symbol,
             "startDate": start_date,
@@ -103,11 +437,11 @@ class DataFetcher:
 
         # Send request to Tiingo API
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            response = self._session.get(url, params=params, timeout=10)
             response.raise_for_status()  # Raise an exception for HTTP errors
         except requests.exceptions.RequestException as e:
             print(f"Request error: {e}")
-            return pd.DataFrame()
+            return None
 
         # Parse JSON response
         try:
@@ -117,15 +451,9 @@ class DataFetcher:
                 return pd.DataFrame()
         except (ValueError, KeyError) as e:
             print(f"Error parsing response data: {e}")
-            return pd.DataFrame()
-
-        df = self._normalize_tiingo_data(data[0]["priceData"], symbol)
+            return None
 
-        # Save the fetched data to CSV
-        print(f"Saving crypto data to {filename}...")
-        df.to_csv(filename, index=False)
-
-        return df
+        return self._normalize_tiingo_data(data[0]["priceData"], symbol)
 
     def _normalize_tiingo_data(self, data, asset_name):
         """Normalize Tiingo stock data to match the required schema."""
@@ -134,13 +462,15 @@ class DataFetcher:
             return pd.DataFrame()
 
         try:
-            normalized_data = pd.DataFrame(data)
+            # Only materialise the schema columns; Tiingo returns several extra fields per row
+            normalized_data = pd.DataFrame(data, columns=TIINGO_COLUMNS)
         except ValueError as e:
             print(f"Error in processing data for {asset_name}: {e}")
-            return pd.DataFrame()
+            return None
 
+        # Tiingo timestamps are ISO 8601, so skip per-element format inference
         normalized_data["date"] = pd.to_datetime(
-            normalized_data["date"], errors="coerce"
+            normalized_data["date"], format="ISO8601", errors="coerce"
         )
 
-        return normalized_data[["date", "open", "high", "low", "close", "volume"]]
+        return normalized_data
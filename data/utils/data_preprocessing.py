@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 
@@ -26,6 +27,9 @@ def preprocess_data(data: pd.DataFrame) -> pd.DataFrame:
         if not pd.api.types.is_numeric_dtype(data[col]):
             raise ValueError(f"Column {col} contains non-numeric values.")
 
+    # Drop rows with infinite values so every remaining input is finite
+    data = data[np.isfinite(data[required_columns]).all(axis=1)]
+
     # Optionally: You can normalize or scale the data here if needed
     # Example: data[required_columns] = (data[required_columns] - data[required_columns].mean()) / data[required_columns].std()
 
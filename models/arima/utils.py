@@ -43,11 +43,5 @@ def grid_search_arima(self, data: pd.Series, p_values, d_values, q_values):
 def reverse_differencing(original_data: pd.Series, predictions: pd.Series) -> pd.Series:
     """Reverse differencing by adding the previous values to the predictions."""
     last_observed_value = original_data.iloc[-1]  # Use .iloc for position-based access
-    for i in range(len(predictions)):
-        predictions.iloc[i] = (
-            predictions.iloc[i] + last_observed_value
-        )  # Use .iloc for position-based setting
-        last_observed_value = predictions.iloc[
-            i
-        ]  # Update last observed value using .iloc
-    return predictions
+    # Each step adds onto the previous restored value, i.e. a running sum anchored at the last observation
+    return predictions.cumsum() + last_observed_value
@@ -60,11 +60,13 @@ class Model(ABC):
                 print_colored(f"PyTorch model saved as {model_dir}/model.pt", "success")
         elif self.model_type == "pkl":
             # Save the model (joblib or pickle) and scaler (if applicable)
-            joblib.dump(self.model, os.path.join(model_dir, "model.pkl"))
+            # Compression shrinks tree-ensemble pickles several-fold on disk
+            joblib.dump(self.model, os.path.join(model_dir, "model.pkl"), compress=3)
             if self.scaler:
                 joblib.dump(
                     self.scaler,
                     os.path.join(model_dir, "scaler.pkl"),
+                    compress=3,
                 )
             if self.debug:
                 print_colored(
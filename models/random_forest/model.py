@@ -1,11 +1,13 @@
 # pylint: disable=R0801
+import numpy as np
 import pandas as pd
+import sklearn
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import MinMaxScaler
 
 from models.base_model import Model
 from models.random_forest.configs import RandomForestConfig
-from utils.model_commons import split_and_scale_data
+from utils.model_commons import predict_in_batches, split_and_scale_data
 
 
 class RandomForestModel(Model):
@@ -20,6 +22,7 @@ class RandomForestModel(Model):
             n_estimators=self.config.n_estimators,
             max_depth=self.config.max_depth,
             random_state=self.config.random_state,
+            n_jobs=self.config.n_jobs,
         )
         self.scaler = MinMaxScaler(feature_range=self.config.scaler_feature_range)
 
@@ -33,11 +36,16 @@ class RandomForestModel(Model):
             split_and_scale_data(features, target, self.scaler)
         )
 
-        # Train the Random Forest model
-        self.model.fit(x_train_scaled, y_train)
+        x_train_scaled = x_train_scaled.astype(np.float32)
+        x_val_scaled = x_val_scaled.astype(np.float32)
 
-        # Evaluate the model
-        val_score = self.model.score(x_val_scaled, y_val)
+        # preprocess_data guarantees finite inputs, so skip sklearn's finiteness scans
+        with sklearn.config_context(assume_finite=True):
+            # Train the Random Forest model
+            self.model.fit(x_train_scaled, y_train)
+
+            # Evaluate the model
+            val_score = self.model.score(x_val_scaled, y_val)
         print(f"Validation R^2 score: {val_score:.4f}")
 
         # Save the model
@@ -59,7 +67,7 @@ class RandomForestModel(Model):
         )  # Make sure the scaler is fitted before calling this
 
         # Make predictions using the trained model
-        predictions = self.model.predict(features_scaled)
+        predictions = predict_in_batches(self.model, features_scaled)
 
         return pd.DataFrame({"prediction": predictions})
 
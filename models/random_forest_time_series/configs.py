@@ -1,3 +1,4 @@
+# pylint: disable=R0801
 #  Description: Configuration class for Random Forest Time Series model.
 
 
@@ -11,6 +12,7 @@ class RandomForestTimeSeriesConfig:
         # RandomForest hyperparameters
         self.n_estimators = 100  # Number of trees in the forest
         self.max_depth = None  # Maximum depth of the tree
+        self.n_jobs = -1  # Number of parallel jobs (-1 uses all CPU cores)
         self.random_state = 42  # Seed for reproducibility
         self.test_size = 0.2  # Proportion of data to use for validation
         self.n_lags = 5  # Number of lag features
@@ -23,6 +25,7 @@ class RandomForestTimeSeriesConfig:
         print("RandomForestTimeSeries Configuration:")
         print(f"  n_estimators: {self.n_estimators}")
         print(f"  max_depth: {self.max_depth}")
+        print(f"  n_jobs: {self.n_jobs}")
         print(f"  random_state: {self.random_state}")
         print(f"  test_size: {self.test_size}")
         print(f"  n_lags: {self.n_lags}")
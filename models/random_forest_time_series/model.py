@@ -1,11 +1,19 @@
 # pylint: disable=R0801
+import numpy as np
 import pandas as pd
+import sklearn
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import MinMaxScaler
 
 from models.base_model import Model
 from models.random_forest_time_series.configs import RandomForestTimeSeriesConfig
-from utils.model_commons import create_lag_features, split_and_scale_data
+from utils.model_commons import (
+    LAG_INPUT_COLUMNS,
+    create_lag_features,
+    lag_feature_columns,
+    predict_in_batches,
+    split_and_scale_data,
+)
 
 
 class RandomForestTimeSeriesModel(Model):
@@ -23,19 +31,20 @@ class RandomForestTimeSeriesModel(Model):
             n_estimators=self.config.n_estimators,
             max_depth=self.config.max_depth,
             random_state=self.config.random_state,
+            n_jobs=self.config.n_jobs,
         )
         self.scaler = MinMaxScaler(feature_range=self.config.scaler_feature_range)
         self.n_lags = self.config.n_lags  # Use configurable number of lags
+        self.feature_columns = lag_feature_columns(self.n_lags)
 
     def train(self, data: pd.DataFrame):
         # Create lag features for the 'close' column
-        data_with_lags = create_lag_features(data, "close", self.n_lags)
+        data_with_lags = create_lag_features(
+            data[LAG_INPUT_COLUMNS], "close", self.n_lags
+        )
 
         # Define features and target (lags as features, close as target)
-        features = data_with_lags[
-            ["open", "high", "low", "volume"]
-            + [f"lag_{i}" for i in range(1, self.n_lags + 1)]
-        ].values
+        features = data_with_lags[self.feature_columns].values
         target = data_with_lags["close"].values
 
         # Split data into training and validation sets Fit and transform the scaler during training
@@ -49,11 +58,16 @@ class RandomForestTimeSeriesModel(Model):
             )
         )
 
-        # Train the Random Forest model
-        self.model.fit(x_train_scaled, y_train)
+        x_train_scaled = x_train_scaled.astype(np.float32)
+        x_val_scaled = x_val_scaled.astype(np.float32)
+
+        # preprocess_data guarantees finite inputs, so skip sklearn's finiteness scans
+        with sklearn.config_context(assume_finite=True):
+            # Train the Random Forest model
+            self.model.fit(x_train_scaled, y_train)
 
-        # Evaluate the model
-        val_score = self.model.score(x_val_scaled, y_val)
+            # Evaluate the model
+            val_score = self.model.score(x_val_scaled, y_val)
         print(f"Validation R^2 score: {val_score:.4f}")
 
         # Save the model
@@ -65,11 +79,10 @@ class RandomForestTimeSeriesModel(Model):
             raise ValueError("Input data must be a Pandas DataFrame.")
 
         # Create lag features for prediction
-        input_data_with_lags = create_lag_features(input_data, "close", self.n_lags)
-        features = input_data_with_lags[
-            ["open", "high", "low", "volume"]
-            + [f"lag_{i}" for i in range(1, self.n_lags + 1)]
-        ].values
+        input_data_with_lags = create_lag_features(
+            input_data[LAG_INPUT_COLUMNS], "close", self.n_lags
+        )
+        features = input_data_with_lags[self.feature_columns].values
 
         # Check if there are enough samples for inference
         if len(features) == 0:
@@ -81,7 +94,7 @@ class RandomForestTimeSeriesModel(Model):
         features_scaled = self.scaler.transform(features)
 
         # Make predictions using the trained model
-        predictions = self.model.predict(features_scaled)
+        predictions = predict_in_batches(self.model, features_scaled)
 
         # Ensure the predictions have the same index as input_data_with_lags, not input_data
         predictions_df = pd.DataFrame(
@@ -4,7 +4,11 @@ from sklearn.preprocessing import MinMaxScaler
 
 from models.base_model import Model
 from models.regression_time_series.configs import RegressionTimeSeriesConfig
-from utils.model_commons import create_lag_features
+from utils.model_commons import (
+    LAG_INPUT_COLUMNS,
+    create_lag_features,
+    lag_feature_columns,
+)
 
 
 class RegressionTimeSeriesModel(Model):
@@ -24,17 +28,17 @@ class RegressionTimeSeriesModel(Model):
         self.n_lags = (
             config.n_lags
         )  # Set the number of lag features based on the config
+        self.feature_columns = lag_feature_columns(self.n_lags)
         self.config = config
 
     def train(self, data: pd.DataFrame):
         # Create lag features for the 'close' column
-        data_with_lags = create_lag_features(data, "close", self.n_lags)
+        data_with_lags = create_lag_features(
+            data[LAG_INPUT_COLUMNS], "close", self.n_lags
+        )
 
         # Define features and target (lags as features, 'close' as target)
-        x = data_with_lags[
-            ["open", "high", "low", "volume"]
-            + [f"lag_{i}" for i in range(1, self.n_lags + 1)]
-        ]
+        x = data_with_lags[self.feature_columns]
         y = data_with_lags["close"]
 
         # Normalize the features using MinMaxScaler
@@ -48,13 +52,12 @@ class RegressionTimeSeriesModel(Model):
 
     def inference(self, input_data: pd.DataFrame) -> pd.DataFrame:
         # Create lag features for prediction
-        input_data_with_lags = create_lag_features(input_data, "close", self.n_lags)
+        input_data_with_lags = create_lag_features(
+            input_data[LAG_INPUT_COLUMNS], "close", self.n_lags
+        )
 
         # Define features for prediction
-        x_test = input_data_with_lags[
-            ["open", "high", "low", "volume"]
-            + [f"lag_{i}" for i in range(1, self.n_lags + 1)]
-        ]
+        x_test = input_data_with_lags[self.feature_columns]
 
         # Check if there are enough samples for inference
         if len(x_test) == 0:
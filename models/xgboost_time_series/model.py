@@ -5,7 +5,12 @@ from sklearn.preprocessing import MinMaxScaler
 
 from models.base_model import Model
 from models.xgboost_time_series.configs import XgboostTimeSeriesConfig
-from utils.model_commons import create_lag_features, split_and_scale_data
+from utils.model_commons import (
+    LAG_INPUT_COLUMNS,
+    create_lag_features,
+    lag_feature_columns,
+    split_and_scale_data,
+)
 
 
 class XgboostTimeSeriesModel(Model):
@@ -23,16 +28,16 @@ class XgboostTimeSeriesModel(Model):
             feature_range=self.config.scaler_feature_range
         )  # Initialize the scaler with the configured range
         self.n_lags = self.config.n_lags  # Use the lag configuration from the config
+        self.feature_columns = lag_feature_columns(self.n_lags)
 
     def train(self, data: pd.DataFrame):
         # Create lag features for the 'close' column
-        data_with_lags = create_lag_features(data, "close", self.n_lags)
+        data_with_lags = create_lag_features(
+            data[LAG_INPUT_COLUMNS], "close", self.n_lags
+        )
 
         # Define features and target
-        features = data_with_lags[
-            ["open", "high", "low", "volume"]
-            + [f"lag_{i}" for i in range(1, self.n_lags + 1)]
-        ].values
+        features = data_with_lags[self.feature_columns].values
         target = data_with_lags["close"].values
 
         # Split data into training and validation sets Fit and transform the scaler during training
@@ -66,13 +71,12 @@ class XgboostTimeSeriesModel(Model):
 
     def inference(self, input_data: pd.DataFrame) -> pd.DataFrame:
         # Create lag features for prediction
-        input_data_with_lags = create_lag_features(input_data, "close", self.n_lags)
+        input_data_with_lags = create_lag_features(
+            input_data[LAG_INPUT_COLUMNS], "close", self.n_lags
+        )
 
         # Select and scale the features for prediction
-        features = input_data_with_lags[
-            ["open", "high", "low", "volume"]
-            + [f"lag_{i}" for i in range(1, self.n_lags + 1)]
-        ].values
+        features = input_data_with_lags[self.feature_columns].values
 
         # Check if there are enough samples for inference
         if len(features) == 0:
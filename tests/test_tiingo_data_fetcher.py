@@ -0,0 +1,284 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from data.tiingo_data_fetcher import DataFetcher
+
+
+class StubRequester:
+    """Stand-in for the Tiingo request methods that serves synthetic 6-hour bars."""
+
+    def __init__(self, volume=10, max_rows=None, weekdays_only=False, fail=False):
+        self.volume = volume
+        self.max_rows = max_rows
+        self.weekdays_only = weekdays_only
+        self.fail = fail
+        self.calls = []
+
+    def __call__(self, symbol, start_date, end_date, frequency):
+        self.calls.append((start_date, end_date))
+        dates = pd.date_range(
+            start_date,
+            pd.Timestamp(end_date) + pd.Timedelta(days=1),
+            freq="6h",
+            inclusive="left",
+            tz="UTC",
+        )
+        if self.fail:
+            return None
+        if self.weekdays_only:
+            dates = dates[pd.Series(dates).dt.dayofweek.to_numpy() < 5]
+        if self.max_rows is not None:
+            dates = dates[: self.max_rows]
+        return pd.DataFrame(
+            {
+                "date": dates,
+                "open": 1,
+                "high": 2,
+                "low": 0,
+                "close": range(len(dates)),
+                "volume": self.volume,
+            }
+        )
+
+
+class MonthlyStubRequester(StubRequester):
+    """Stand-in that resamples daily bars over the request window, as Tiingo does."""
+
+    def __call__(self, symbol, start_date, end_date, frequency):
+        self.calls.append((start_date, end_date))
+        dates = pd.Series(pd.date_range(start_date, end_date, freq="D", tz="UTC"))
+        months = dates.groupby(dates.dt.strftime("%Y-%m"))
+        # Each bar is labelled with the last day of its month inside the window
+        labels = months.max()
+        return pd.DataFrame(
+            {
+                "date": labels.to_numpy(),
+                "open": 1,
+                "high": 2,
+                "low": 0,
+                "close": months.size().to_numpy(),
+                "volume": self.volume,
+            }
+        )
+
+
+class TestRangeAwareCache(unittest.TestCase):
+    """Tests for the range-aware Tiingo cache in DataFetcher."""
+
+    def setUp(self):
+        cache_folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_folder)
+        self.fetcher = DataFetcher(cache_folder=cache_folder)
+
+    def fetch(self, requester, start_date, end_date):
+        # pylint: disable=protected-access
+        return self.fetcher._fetch_with_cache(
+            "btcusd", start_date, end_date, "6hour", requester
+        )
+
+    def assert_complete(self, df, start_date, end_date):
+        expected = pd.date_range(
+            start_date,
+            pd.Timestamp(end_date) + pd.Timedelta(days=1),
+            freq="6h",
+            inclusive="left",
+            tz="UTC",
+        )
+        self.assertListEqual(list(df["date"]), list(expected))
+
+    # Each missing range ends with a follow-up request for its last day, which
+    # confirms the day is complete when it returns no new rows
+
+    def test_cold_cache_fetches_requested_range(self):
+        requester = StubRequester()
+        df = self.fetch(requester, "2022-01-05", "2022-01-10")
+
+        self.assertEqual(
+            requester.calls,
+            [("2022-01-05", "2022-01-10"), ("2022-01-10", "2022-01-10")],
+        )
+        self.assert_complete(df, "2022-01-05", "2022-01-10")
+
+    def test_fully_cached_hit_makes_no_requests(self):
+        self.fetch(StubRequester(), "2022-01-05", "2022-01-10")
+
+        requester = StubRequester()
+        df = self.fetch(requester, "2022-01-06", "2022-01-08")
+
+        self.assertEqual(requester.calls, [])
+        self.assert_complete(df, "2022-01-06", "2022-01-08")
+
+    def test_backfill_requests_only_missing_earlier_days(self):
+        self.fetch(StubRequester(), "2022-01-05", "2022-01-10")
+
+        requester = StubRequester()
+        df = self.fetch(requester, "2022-01-01", "2022-01-10")
+
+        self.assertEqual(
+            requester.calls,
+            [("2022-01-01", "2022-01-04"), ("2022-01-04", "2022-01-04")],
+        )
+        self.assert_complete(df, "2022-01-01", "2022-01-10")
+
+    def test_extension_requests_only_missing_later_days(self):
+        self.fetch(StubRequester(), "2022-01-05", "2022-01-10")
+
+        requester = StubRequester()
+        df = self.fetch(requester, "2022-01-05", "2022-01-15")
+
+        self.assertEqual(
+            requester.calls,
+            [("2022-01-11", "2022-01-15"), ("2022-01-15", "2022-01-15")],
+        )
+        self.assert_complete(df, "2022-01-05", "2022-01-15")
+
+    def test_gap_between_cached_ranges_is_filled(self):
+        self.fetch(StubRequester(), "2022-01-01", "2022-01-03")
+        self.fetch(StubRequester(), "2022-01-08", "2022-01-10")
+
+        requester = StubRequester()
+        df = self.fetch(requester, "2022-01-01", "2022-01-10")
+
+        self.assertEqual(
+            requester.calls,
+            [("2022-01-04", "2022-01-07"), ("2022-01-07", "2022-01-07")],
+        )
+        self.assert_complete(df, "2022-01-01", "2022-01-10")
+
+    def test_unpadded_dates_are_normalised(self):
+        self.fetch(StubRequester(), "2022-01-05", "2022-01-10")
+
+        requester = StubRequester()
+        df = self.fetch(requester, "2022-1-5", "2022-1-10")
+
+        self.assertEqual(requester.calls, [])
+        self.assert_complete(df, "2022-01-05", "2022-01-10")
+
+    def test_truncated_response_is_continued(self):
+        requester = StubRequester(max_rows=10)
+        df = self.fetch(requester, "2022-01-01", "2022-01-05")
+
+        self.assertEqual(requester.calls[0], ("2022-01-01", "2022-01-05"))
+        self.assertGreater(len(requester.calls), 1)
+        self.assert_complete(df, "2022-01-01", "2022-01-05")
+
+    def test_range_without_data_is_recorded(self):
+        # 2022-01-08 and 2022-01-09 are a weekend
+        self.fetch(StubRequester(weekdays_only=True), "2022-01-08", "2022-01-09")
+
+        requester = StubRequester(weekdays_only=True)
+        df = self.fetch(requester, "2022-01-08", "2022-01-09")
+
+        self.assertEqual(requester.calls, [])
+        self.assertTrue(df.empty)
+
+    def test_failed_request_is_retried(self):
+        self.fetch(StubRequester(fail=True), "2022-01-05", "2022-01-10")
+
+        requester = StubRequester()
+        df = self.fetch(requester, "2022-01-05", "2022-01-10")
+
+        self.assertEqual(requester.calls[0], ("2022-01-05", "2022-01-10"))
+        self.assert_complete(df, "2022-01-05", "2022-01-10")
+
+    def test_mixed_dtype_appends_stay_readable(self):
+        self.fetch(StubRequester(volume=10), "2022-01-05", "2022-01-10")
+        df = self.fetch(StubRequester(volume=0.5), "2022-01-01", "2022-01-10")
+
+        self.assert_complete(df, "2022-01-01", "2022-01-10")
+        self.assertEqual(df["volume"].dtype, "float64")
+        self.assertEqual(df.loc[df["date"] < "2022-01-05", "volume"].unique(), [0.5])
+
+    def test_legacy_cache_files_are_imported(self):
+        legacy = StubRequester()("btcusd", "2022-01-01", "2022-01-03", "6hour")
+        legacy.to_csv(
+            os.path.join(
+                self.fetcher.cache_folder, "btcusd_2022-01-01_to_2022-01-03_6hour.csv"
+            ),
+            index=False,
+        )
+
+        requester = StubRequester()
+        df = self.fetch(requester, "2022-01-01", "2022-01-05")
+
+        # The legacy file's last day is confirmed along with the new days
+        self.assertEqual(requester.calls[0], ("2022-01-03", "2022-01-05"))
+        self.assert_complete(df, "2022-01-01", "2022-01-05")
+
+
+class TestResampledCache(unittest.TestCase):
+    """Tests for the exact-range cache used by resampled stock frequencies."""
+
+    def setUp(self):
+        cache_folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_folder)
+        self.fetcher = DataFetcher(cache_folder=cache_folder)
+
+    def fetch(self, requester, start_date, end_date):
+        # pylint: disable=protected-access
+        return self.fetcher._fetch_with_cache(
+            "aapl", start_date, end_date, "monthly", requester
+        )
+
+    def test_repeated_request_makes_no_requests(self):
+        self.fetch(MonthlyStubRequester(), "2022-01-01", "2022-07-31")
+
+        requester = MonthlyStubRequester()
+        df = self.fetch(requester, "2022-01-01", "2022-07-31")
+
+        self.assertEqual(requester.calls, [])
+        self.assertEqual(len(df), 7)
+
+    def test_partial_period_is_not_reused(self):
+        self.fetch(MonthlyStubRequester(), "2022-01-01", "2022-07-15")
+
+        requester = MonthlyStubRequester()
+        df = self.fetch(requester, "2022-01-01", "2022-07-31")
+
+        # The extended range is requested whole, so July comes back as a single full bar
+        self.assertEqual(requester.calls, [("2022-01-01", "2022-07-31")])
+        july = df[df["date"].dt.month == 7]
+        self.assertEqual(list(july["date"]), [pd.Timestamp("2022-07-31", tz="UTC")])
+        self.assertEqual(list(july["close"]), [31])
+
+
+class TestIterBatches(unittest.TestCase):
+    """Tests for chunked reads of the Tiingo cache."""
+
+    def setUp(self):
+        cache_folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_folder)
+        self.fetcher = DataFetcher(cache_folder=cache_folder)
+
+    def test_batches_are_in_date_order(self):
+        # pylint: disable=protected-access
+        # Cache the later months first so the earlier ones are backfilled in separate files
+        for start_date, end_date in [
+            ("2024-06-01", "2024-10-31"),
+            ("2024-01-01", "2024-03-31"),
+            ("2024-04-01", "2024-05-31"),
+        ]:
+            self.fetcher._fetch_with_cache(
+                "btcusd", start_date, end_date, "6hour", StubRequester()
+            )
+
+        batches = list(
+            self.fetcher.iter_batches(
+                "btcusd", "2024-01-01", "2024-10-31", "6hour", batch_size=100
+            )
+        )
+
+        self.assertTrue(all(len(batch) <= 100 for batch in batches))
+        dates = pd.concat(batches, ignore_index=True)["date"]
+        self.assertTrue(dates.is_monotonic_increasing)
+        self.assertTrue(dates.is_unique)
+        self.assertEqual(dates.iloc[0], pd.Timestamp("2024-01-01", tz="UTC"))
+        self.assertEqual(dates.iloc[-1], pd.Timestamp("2024-10-31 18:00", tz="UTC"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -20,13 +20,29 @@ def set_seed(seed):
         torch.backends.cudnn.benchmark = False
 
 
+# Columns the lag models read from the input data; 'close' is both a feature source and the target
+LAG_INPUT_COLUMNS = ["open", "high", "low", "volume", "close"]
+
+
+def lag_feature_columns(n_lags: int) -> list:
+    """Return the feature columns used by the lag models: open/high/low/volume plus close lags."""
+    return ["open", "high", "low", "volume"] + [
+        f"lag_{lag}" for lag in range(1, n_lags + 1)
+    ]
+
+
 def create_lag_features(
     data: pd.DataFrame, target_col: str, n_lags: int
 ) -> pd.DataFrame:
     """Create lag features for the target column."""
-    df = data.copy()
+    values = data[target_col].to_numpy(dtype=np.float64)
+
+    # Fill every lag into one preallocated matrix instead of shifting a Series per lag
+    lags = np.full((len(values), n_lags), np.nan)
     for lag in range(1, n_lags + 1):
-        df[f"lag_{lag}"] = df[target_col].shift(lag)
+        lags[lag:, lag - 1] = values[:-lag]
+
+    df = data.assign(**{f"lag_{lag}": lags[:, lag - 1] for lag in range(1, n_lags + 1)})
     return df.dropna()
 
 
@@ -56,3 +72,20 @@ def split_and_scale_data(features, target, scaler=None, test_size=0.2, random_st
     x_val_scaled = scaler.transform(x_val)
 
     return x_train_scaled, x_val_scaled, y_train, y_val, scaler
+
+
+def predict_in_batches(model, features, batch_size=65536):
+    """
+    Predict in fixed-size row batches, writing into a preallocated output array.
+    This bounds the estimator's per-call working memory regardless of input length.
+
+    :param model: A fitted estimator exposing predict()
+    :param features: 2D feature array (X)
+    :param batch_size: Number of rows to predict per call.
+    :return: 1D array of predictions.
+    """
+    predictions = np.empty(features.shape[0], dtype=np.float64)
+    for start in range(0, features.shape[0], batch_size):
+        stop = start + batch_size
+        predictions[start:stop] = model.predict(features[start:stop])
+    return predictions